@@ -22,10 +22,23 @@ import os
 import re
 import sys
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+try:
+    import orjson
+    _loads = orjson.loads
+
+    def _dumps(data) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(data) -> bytes:
+        return json.dumps(data, indent=2).encode()
+
 # OpenCode storage path
 STORAGE_PATH = Path.home() / ".local" / "share" / "opencode" / "storage"
 MESSAGE_PATH = STORAGE_PATH / "message"
@@ -33,27 +46,165 @@ SESSION_PATH = STORAGE_PATH / "session"
 PART_PATH = STORAGE_PATH / "part"
 BACKUP_PATH = Path.home() / ".local" / "share" / "opencode" / "repair-backups"
 
+# Number of session directories scanned concurrently
+SCAN_WORKERS = min(32, (os.cpu_count() or 4) * 4)
+
+# Cheap pre-filter on the raw file bytes, so healthy messages are never JSON-parsed
+_ERR_SIG = re.compile(rb'Invalid[^"}]{0,200}signature[^"}]{0,200}thinking')
+# Fields needed to order a session's messages, read from the start of the file
+_HEAD_SIZE = 4096
+_HEAD_ROLE_RE = re.compile(rb'"role"\s*:\s*"(\w+)"')
+_HEAD_TIME_RE = re.compile(rb'"time"\s*:\s*\{\s*"created"\s*:\s*(\d+)')
+_JSON_STR_RE = re.compile(rb'"(?:[^"\\]|\\.)*"')
+# Position of the offending block in the API request (e.g., "messages.1.content.0")
+_POS_RE = re.compile(r'messages\.(\d+)\.content\.(\d+)')
+
+
+def _iter_msg_files(session_dir: str):
+    """Yield the paths of all msg_*.json files in a session directory."""
+    try:
+        with os.scandir(session_dir) as it:
+            for entry in it:
+                if (entry.is_file(follow_symlinks=False)
+                        and entry.name.startswith("msg_")
+                        and entry.name.endswith(".json")):
+                    yield entry.path
+    except OSError:
+        # Missing, deleted mid-scan or unreadable: skip the directory
+        return
+
+
+# session_id -> session metadata file, built on first use
+_SESSION_FILE_INDEX: Optional[dict[str, Path]] = None
+_SESSION_TITLE_CACHE: dict[str, str] = {}
+
+
+def _build_session_index() -> dict[str, Path]:
+    """Map every session ID to its metadata file with one pass over SESSION_PATH."""
+    index = {}
+    if not SESSION_PATH.exists():
+        return index
+    
+    with os.scandir(SESSION_PATH) as projects:
+        project_dirs = [e.path for e in projects if e.is_dir()]
+    
+    for project_dir in project_dirs:
+        with os.scandir(project_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".json") and entry.is_file():
+                    index[entry.name[:-len(".json")]] = Path(entry.path)
+    return index
+
+
+def get_session_file(session_id: str) -> Optional[Path]:
+    """Get the metadata file of a session, if there is one."""
+    global _SESSION_FILE_INDEX
+    
+    if _SESSION_FILE_INDEX is None:
+        _SESSION_FILE_INDEX = _build_session_index()
+    return _SESSION_FILE_INDEX.get(session_id)
+
 
 def get_session_title(session_id: str) -> str:
     """Get the title of a session from its metadata."""
-    for project_dir in SESSION_PATH.iterdir():
-        if not project_dir.is_dir():
-            continue
-        session_file = project_dir / f"{session_id}.json"
-        if session_file.exists():
+    if session_id in _SESSION_TITLE_CACHE:
+        return _SESSION_TITLE_CACHE[session_id]
+    
+    title = "Unknown"
+    session_file = get_session_file(session_id)
+    if session_file is not None:
+        try:
+            data = _loads(session_file.read_bytes())
+            title = data.get("title", "Untitled")
+        except (json.JSONDecodeError, IOError):
+            pass
+    
+    _SESSION_TITLE_CACHE[session_id] = title
+    return title
+
+
+def _scan_one_session(session_dir: str) -> list[dict]:
+    """Return the thinking block signature errors found in one session directory."""
+    corrupted = []
+    session_id = os.path.basename(session_dir)
+    
+    # Check each message file in the session. A worker must not raise for an
+    # I/O problem in its directory, or executor.map would abort the whole scan.
+    try:
+        for msg_file in _iter_msg_files(session_dir):
             try:
-                with open(session_file) as f:
-                    data = json.load(f)
-                    return data.get("title", "Untitled")
+                with open(msg_file, "rb") as f:
+                    raw = f.read()
+                if not _ERR_SIG.search(raw):
+                    continue
+                data = _loads(raw)
             except (json.JSONDecodeError, IOError):
-                pass
-    return "Unknown"
+                # Skip files that can't be read
+                continue
+            
+            # Check if message has the signature error
+            error = data.get("error", {})
+            error_data = error.get("data", {})
+            error_msg = error_data.get("message", "")
+            
+            if "Invalid" in error_msg and "signature" in error_msg and "thinking" in error_msg:
+                # Extract the message position from error (e.g., "messages.1.content.0")
+                position_match = _POS_RE.search(error_msg)
+                msg_index = int(position_match.group(1)) if position_match else None
+                content_index = int(position_match.group(2)) if position_match else None
+            
+                # Extract timestamp
+                time_info = data.get("time", {})
+                created = time_info.get("created", 0)
+            
+                corrupted.append({
+                    "message_id": data.get("id", os.path.basename(msg_file)[:-len(".json")]),
+                    "session_id": session_id,
+                    "error_message": error_msg,
+                    "error_msg_index": msg_index,
+                    "error_content_index": content_index,
+                    "timestamp": created,
+                    "model_id": data.get("modelID", "Unknown"),
+                    "provider_id": data.get("providerID", "Unknown"),
+                    "file_path": msg_file,
+                })
+    except OSError:
+        pass
+    
+    return corrupted
 
 
-def find_corrupted_messages() -> list[dict]:
+def _iter_corrupted_raw():
+    """
+    Lazily yield the thinking block signature errors found in the message store.
+    
+    Entries carry only what is read straight from the message file; the
+    corrupted messages of one session are yielded consecutively. Session
+    directories are scanned concurrently since the work is I/O-bound.
+    """
+    if not MESSAGE_PATH.exists():
+        return
+    
+    # Iterate through all session directories
+    with os.scandir(MESSAGE_PATH) as it:
+        session_dirs = [e.path for e in it if e.is_dir()]
+    
+    with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as executor:
+        try:
+            for result in executor.map(_scan_one_session, session_dirs):
+                yield from result
+        finally:
+            # Don't start scanning sessions nobody will look at after an early stop
+            executor.shutdown(cancel_futures=True)
+
+
+def find_corrupted_messages(raw: Optional[list[dict]] = None) -> list[dict]:
     """
     Scan all message files for thinking block signature errors.
     Returns a list of corrupted message info sorted by time (newest first).
+    
+    raw can hold the complete output of an earlier _iter_corrupted_raw() pass,
+    in which case the store isn't scanned again.
     """
     corrupted = []
     
@@ -61,73 +212,102 @@ def find_corrupted_messages() -> list[dict]:
         print(f"Error: Message path not found: {MESSAGE_PATH}")
         return corrupted
     
-    # Iterate through all session directories
-    for session_dir in MESSAGE_PATH.iterdir():
-        if not session_dir.is_dir():
-            continue
-        
-        session_id = session_dir.name
-        
-        # Check each message file in the session
-        for msg_file in session_dir.glob("msg_*.json"):
-            try:
-                with open(msg_file) as f:
-                    data = json.load(f)
-                
-                # Check if message has the signature error
-                error = data.get("error", {})
-                error_data = error.get("data", {})
-                error_msg = error_data.get("message", "")
-                
-                if "Invalid" in error_msg and "signature" in error_msg and "thinking" in error_msg:
-                    # Extract the message position from error (e.g., "messages.1.content.0")
-                    position_match = re.search(r'messages\.(\d+)\.content\.(\d+)', error_msg)
-                    msg_index = int(position_match.group(1)) if position_match else None
-                    content_index = int(position_match.group(2)) if position_match else None
-                    
-                    # Extract timestamp
-                    time_info = data.get("time", {})
-                    created = time_info.get("created", 0)
-                    
-                    # Get session title
-                    title = get_session_title(session_id)
-                    
-                    corrupted.append({
-                        "message_id": data.get("id", msg_file.stem),
-                        "session_id": session_id,
-                        "session_title": title,
-                        "error_message": error_msg,
-                        "error_msg_index": msg_index,
-                        "error_content_index": content_index,
-                        "timestamp": created,
-                        "timestamp_str": datetime.fromtimestamp(created / 1000).strftime("%Y-%m-%d %H:%M:%S") if created else "Unknown",
-                        "model_id": data.get("modelID", "Unknown"),
-                        "provider_id": data.get("providerID", "Unknown"),
-                        "file_path": str(msg_file),
-                    })
-            except (json.JSONDecodeError, IOError) as e:
-                # Skip files that can't be read
-                continue
+    for msg in (raw if raw is not None else _iter_corrupted_raw()):
+        msg["session_title"] = get_session_title(msg["session_id"])
+        corrupted.append(msg)
     
     # Sort by timestamp, newest first
     corrupted.sort(key=lambda x: x["timestamp"], reverse=True)
     return corrupted
 
 
+def _get_session_dir(session_id: str) -> Optional[str]:
+    """Get the message directory of a session if session_id is a full session ID."""
+    if session_id in ("", ".", "..") or os.path.basename(session_id) != session_id:
+        return None
+    session_dir = MESSAGE_PATH / session_id
+    return str(session_dir) if session_dir.is_dir() else None
+
+
+def _find_exact_target(target: str, seen: list[dict]) -> Optional[dict]:
+    """
+    Stream the scan and stop as soon as the corrupted message whose message ID
+    equals target has been found.
+    
+    Every entry read is appended to seen, so when nothing matches it holds
+    the whole scan.
+    """
+    for msg in _iter_corrupted_raw():
+        seen.append(msg)
+        if msg["message_id"] == target:
+            return msg
+    return None
+
+
+def _is_top_level(raw: bytes, pos: int) -> bool:
+    """Whether raw[pos] sits directly inside the outermost JSON object."""
+    # Blank out string contents so braces inside them aren't counted
+    prefix = _JSON_STR_RE.sub(b'""', raw[:pos])
+    return (prefix.count(b"{") - prefix.count(b"}") == 1
+            and prefix.count(b"[") == prefix.count(b"]"))
+
+
+def _find_top_level(pattern: re.Pattern, raw: bytes) -> Optional[re.Match]:
+    """Find the first match of pattern that is a field of the outermost object."""
+    for match in pattern.finditer(raw):
+        if _is_top_level(raw, match.start()):
+            return match
+    return None
+
+
+def _read_message_head(msg_file: str) -> dict:
+    """
+    Read the id, role and creation time of a message.
+    
+    The id is taken from the file name (msg files are named <id>.json). Large
+    messages are not parsed in full: role and time.created are picked out of
+    the first _HEAD_SIZE bytes when they are top-level fields there, falling
+    back to a full parse otherwise.
+    """
+    message_id = os.path.basename(msg_file)[:-len(".json")]
+    
+    with open(msg_file, "rb") as f:
+        raw = f.read(_HEAD_SIZE)
+        if len(raw) == _HEAD_SIZE:
+            role_match = _find_top_level(_HEAD_ROLE_RE, raw)
+            time_match = _find_top_level(_HEAD_TIME_RE, raw)
+            if role_match and time_match:
+                return {
+                    "id": message_id,
+                    "role": role_match.group(1).decode(),
+                    "time": {"created": int(time_match.group(1))},
+                }
+            raw += f.read()
+    
+    data = _loads(raw)
+    return {
+        "id": message_id,
+        "role": data.get("role"),
+        "time": {"created": data.get("time", {}).get("created", 0)},
+    }
+
+
 def get_session_messages(session_id: str) -> list[dict]:
-    """Get all messages for a session, sorted by creation time."""
+    """
+    Get the id, role and creation time of all messages in a session,
+    sorted by creation time.
+    """
     messages = []
     session_msg_dir = MESSAGE_PATH / session_id
     
     if not session_msg_dir.exists():
         return messages
     
-    for msg_file in session_msg_dir.glob("msg_*.json"):
+    for msg_file in _iter_msg_files(session_msg_dir):
         try:
-            with open(msg_file) as f:
-                data = json.load(f)
-                data["_file_path"] = msg_file
-                messages.append(data)
+            data = _read_message_head(msg_file)
+            data["_file_path"] = Path(msg_file)
+            messages.append(data)
         except (json.JSONDecodeError, IOError):
             continue
     
@@ -176,7 +356,7 @@ def find_message_to_remove(session_id: str, error_msg_index: int) -> Optional[di
     return None
 
 
-def backup_files(files: list[Path], backup_name: str) -> Path:
+def backup_files(files: list, backup_name: str) -> Path:
     """Create a backup of files before modification."""
     BACKUP_PATH.mkdir(parents=True, exist_ok=True)
     
@@ -184,23 +364,45 @@ def backup_files(files: list[Path], backup_name: str) -> Path:
     backup_dir = BACKUP_PATH / f"{backup_name}_{timestamp}"
     backup_dir.mkdir(parents=True, exist_ok=True)
     
-    for file_path in files:
+    for file_path in map(Path, files):
         if file_path.exists():
             # Preserve directory structure in backup
             rel_path = file_path.relative_to(STORAGE_PATH)
             dest = backup_dir / rel_path
             dest.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(file_path, dest)
+            # The originals are deleted right after the backup, so a hardlink keeps
+            # the data without copying it. Fall back to a copy across filesystems.
+            try:
+                os.link(file_path, dest)
+            except OSError:
+                shutil.copy2(file_path, dest)
     
     return backup_dir
 
 
-def get_message_parts(message_id: str) -> list[Path]:
+def _iter_message_parts(message_id: str):
+    """Yield the paths of all part files of a message."""
+    try:
+        with os.scandir(PART_PATH / message_id) as it:
+            for entry in it:
+                if entry.name.startswith("prt_") and entry.name.endswith(".json"):
+                    yield entry.path
+    except OSError:
+        # Missing, not a directory or unreadable: no parts to report
+        return
+
+
+def get_message_parts(message_id: str) -> list[str]:
     """Get all part files for a message."""
-    parts_dir = PART_PATH / message_id
-    if not parts_dir.exists():
-        return []
-    return list(parts_dir.glob("prt_*.json"))
+    return list(_iter_message_parts(message_id))
+
+
+def _unlink_quiet(path) -> None:
+    """Remove a file, ignoring files that are already gone or can't be removed."""
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
 
 
 def find_error_messages(session_id: str) -> list[dict]:
@@ -211,17 +413,20 @@ def find_error_messages(session_id: str) -> list[dict]:
     if not session_msg_dir.exists():
         return error_messages
     
-    for msg_file in session_msg_dir.glob("msg_*.json"):
+    for msg_file in _iter_msg_files(session_msg_dir):
         try:
-            with open(msg_file) as f:
-                data = json.load(f)
+            with open(msg_file, "rb") as f:
+                raw = f.read()
+            if not _ERR_SIG.search(raw):
+                continue
+            data = _loads(raw)
             
             error = data.get("error", {})
             error_data = error.get("data", {})
             error_msg = error_data.get("message", "")
             
             if "Invalid" in error_msg and "signature" in error_msg and "thinking" in error_msg:
-                data["_file_path"] = msg_file
+                data["_file_path"] = Path(msg_file)
                 error_messages.append(data)
         except (json.JSONDecodeError, IOError):
             continue
@@ -235,63 +440,77 @@ def update_session_after_repair(session_id: str, removed_message_ids: set) -> bo
     This ensures Claude can resume the session without encountering
     references to non-existent messages.
     """
-    for project_dir in SESSION_PATH.iterdir():
-        if not project_dir.is_dir():
-            continue
-        session_file = project_dir / f"{session_id}.json"
-        if session_file.exists():
-            try:
-                with open(session_file) as f:
-                    data = json.load(f)
-                
-                modified = False
-                
-                # Remove references from messageOrder list
-                if "messageOrder" in data and isinstance(data["messageOrder"], list):
-                    data["messageOrder"] = [
-                        msg_id for msg_id in data["messageOrder"]
-                        if msg_id not in removed_message_ids
-                    ]
+    session_file = get_session_file(session_id)
+    if session_file is None:
+        return False
+    
+    try:
+        data = _loads(session_file.read_bytes())
+        
+        modified = False
+        
+        # Remove references from messageOrder list
+        if "messageOrder" in data and isinstance(data["messageOrder"], list):
+            message_order = [
+                msg_id for msg_id in data["messageOrder"]
+                if msg_id not in removed_message_ids
+            ]
+            if len(message_order) != len(data["messageOrder"]):
+                data["messageOrder"] = message_order
+                modified = True
+        
+        # Remove references from messages dict
+        if "messages" in data and isinstance(data["messages"], dict):
+            for msg_id in removed_message_ids:
+                if msg_id in data["messages"]:
+                    del data["messages"][msg_id]
+                    modified = True
+        
+        # Remove references from conversation.history
+        if "conversation" in data and isinstance(data["conversation"], dict):
+            history = data["conversation"].get("history", [])
+            if isinstance(history, list):
+                # Rebuild history without removed messages
+                new_history = []
+                for entry in history:
+                    if isinstance(entry, dict) and entry.get("messageId") not in removed_message_ids:
+                        new_history.append(entry)
+                    elif not isinstance(entry, dict):
+                        new_history.append(entry)
+                if len(new_history) != len(history):
+                    data["conversation"]["history"] = new_history
                     modified = True
-                
-                # Remove references from messages dict
-                if "messages" in data and isinstance(data["messages"], dict):
-                    for msg_id in removed_message_ids:
-                        if msg_id in data["messages"]:
-                            del data["messages"][msg_id]
-                            modified = True
-                
-                # Remove references from conversation.history
-                if "conversation" in data and isinstance(data["conversation"], dict):
-                    history = data["conversation"].get("history", [])
-                    if isinstance(history, list):
-                        # Rebuild history without removed messages
-                        new_history = []
-                        for entry in history:
-                            if isinstance(entry, dict) and entry.get("messageId") not in removed_message_ids:
-                                new_history.append(entry)
-                            elif not isinstance(entry, dict):
-                                new_history.append(entry)
-                        if len(new_history) != len(history):
-                            data["conversation"]["history"] = new_history
-                            modified = True
-                
-                if modified:
-                    with open(session_file, "w") as f:
-                        json.dump(data, f, indent=2)
-                    return True
-                    
-            except (json.JSONDecodeError, IOError, KeyError) as e:
-                pass
-    return False
-
-
-def fix_session(session_id: str, error_msg_index: int = 1, dry_run: bool = False) -> dict:
+        
+        if not modified:
+            return False
+        
+        # Write to a temporary file and swap it in, so a crash mid-write
+        # can't leave a truncated session file behind
+        tmp_file = session_file.with_suffix(".json.tmp")
+        try:
+            with open(tmp_file, "wb") as f:
+                f.write(_dumps(data))
+            shutil.copymode(session_file, tmp_file)
+            os.replace(tmp_file, session_file)
+        except (OSError, TypeError):
+            _unlink_quiet(tmp_file)
+            raise
+        return True
+    except (json.JSONDecodeError, OSError, TypeError):
+        return False
+
+
+def fix_session(session_id: str, error_msg_index: int = 1, dry_run: bool = False, *,
+                msg_to_remove: Optional[dict] = None,
+                error_messages: Optional[list[dict]] = None) -> dict:
     """
     Fix a corrupted session by removing:
     1. The message containing the invalid thinking block (first assistant message)
     2. All error messages that recorded the API failures
     
+    Callers that already know these messages can pass them as msg_to_remove
+    and error_messages; anything not given is looked up from the session.
+    
     Returns a dict with:
         - success: bool
         - messages_removed: list of message IDs
@@ -308,29 +527,34 @@ def fix_session(session_id: str, error_msg_index: int = 1, dry_run: bool = False
     }
     
     # Find the message containing the thinking block to remove
-    msg_to_remove = find_message_to_remove(session_id, error_msg_index)
+    if msg_to_remove is None:
+        msg_to_remove = find_message_to_remove(session_id, error_msg_index)
     
     # Find all error messages to remove
-    error_messages = find_error_messages(session_id)
+    if error_messages is None:
+        error_messages = find_error_messages(session_id)
     
     if not msg_to_remove and not error_messages:
         result["error"] = "Could not identify any messages to remove"
         return result
     
-    # Collect all messages to remove
+    # Collect all messages to remove, skipping duplicates
     messages_to_remove = []
+    seen_ids = set()
     
     if msg_to_remove:
+        seen_ids.add(msg_to_remove.get("id"))
         messages_to_remove.append(msg_to_remove)
     
     for err_msg in error_messages:
-        # Avoid duplicates
-        if err_msg.get("id") not in [m.get("id") for m in messages_to_remove]:
+        message_id = err_msg.get("id")
+        if message_id not in seen_ids:
+            seen_ids.add(message_id)
             messages_to_remove.append(err_msg)
     
     # Collect all files to backup and remove
     files_to_backup = []
-    all_parts = []
+    removals = []
     
     for msg in messages_to_remove:
         message_id = msg.get("id")
@@ -341,11 +565,10 @@ def fix_session(session_id: str, error_msg_index: int = 1, dry_run: bool = False
             files_to_backup.append(msg_file)
             
             # Get associated parts
-            parts = get_message_parts(message_id)
-            all_parts.extend(parts)
+            parts = list(_iter_message_parts(message_id))
             files_to_backup.extend(parts)
-    
-    result["parts_removed"] = len(all_parts)
+            result["parts_removed"] += len(parts)
+            removals.append((message_id, msg_file, parts))
     
     if dry_run:
         result["success"] = True
@@ -355,35 +578,20 @@ def fix_session(session_id: str, error_msg_index: int = 1, dry_run: bool = False
     backup_dir = backup_files(files_to_backup, f"session_{session_id[:20]}")
     result["backup_path"] = str(backup_dir)
     
-    # Remove message files
-    for msg in messages_to_remove:
-        msg_file = msg.get("_file_path")
-        if msg_file and msg_file.exists():
-            try:
-                msg_file.unlink()
-            except IOError as e:
-                # Continue even if some fail
-                pass
+    # Remove each message file along with its parts.
+    # Failures are ignored so one unremovable file doesn't abort the repair.
+    for message_id, msg_file, parts in removals:
+        _unlink_quiet(msg_file)
+        for part_file in parts:
+            _unlink_quiet(part_file)
     
-    # Remove part files
-    for part_file in all_parts:
+    # Remove the removed messages' parts directories once they are empty
+    for message_id, _, _ in removals:
         try:
-            part_file.unlink()
-        except IOError as e:
-            # Continue even if some parts fail
+            os.rmdir(PART_PATH / message_id)
+        except OSError:
             pass
     
-    # Remove empty parts directories
-    for msg in messages_to_remove:
-        message_id = msg.get("id")
-        if message_id:
-            parts_dir = PART_PATH / message_id
-            if parts_dir.exists():
-                try:
-                    parts_dir.rmdir()
-                except OSError:
-                    pass
-    
     # Update session file to remove references to deleted messages
     removed_message_ids = set(result["messages_removed"])
     if removed_message_ids:
@@ -393,22 +601,17 @@ def fix_session(session_id: str, error_msg_index: int = 1, dry_run: bool = False
     return result
 
 
-def list_corrupted():
-    """List all corrupted messages."""
-    print("\nScanning for corrupted sessions...\n")
-    
-    corrupted = find_corrupted_messages()
-    
-    if not corrupted:
-        print("No corrupted sessions found.")
-        return
-    
-    print(f"Found {len(corrupted)} corrupted message(s):\n")
-    print("-" * 100)
+def scan_sessions(preview: bool = False, raw: Optional[list[dict]] = None) -> dict[str, dict]:
+    """
+    Scan for corrupted messages and group them by session, newest first.
     
-    # Group by session
+    Each session summary holds its title, its corrupted messages and the error
+    index of the newest one. With preview=True it also holds the number of
+    messages and parts a fix would remove (fix_messages, fix_parts).
+    raw is passed on to find_corrupted_messages.
+    """
     sessions = {}
-    for msg in corrupted:
+    for msg in find_corrupted_messages(raw):
         sid = msg["session_id"]
         if sid not in sessions:
             sessions[sid] = {
@@ -418,6 +621,38 @@ def list_corrupted():
             }
         sessions[sid]["messages"].append(msg)
     
+    if preview:
+        for session_id, info in sessions.items():
+            # The corrupted messages are exactly the error messages a fix removes,
+            # so only the thinking block message still needs to be looked up
+            msg_to_remove = find_message_to_remove(session_id, info["error_msg_index"])
+            info["fix_messages"] = (1 if msg_to_remove else 0) + len(info["messages"])
+            info["fix_parts"] = sum(len(get_message_parts(msg["message_id"])) for msg in info["messages"])
+            if msg_to_remove:
+                info["fix_parts"] += len(get_message_parts(msg_to_remove.get("id", "")))
+    
+    return sessions
+
+
+def _fmt_ts(ms: int) -> str:
+    """Format a millisecond timestamp for display."""
+    return datetime.fromtimestamp(ms / 1000).strftime("%Y-%m-%d %H:%M:%S") if ms else "Unknown"
+
+
+def list_corrupted():
+    """List all corrupted messages."""
+    print("\nScanning for corrupted sessions...\n")
+    
+    sessions = scan_sessions(preview=True)
+    
+    if not sessions:
+        print("No corrupted sessions found.")
+        return
+    
+    total = sum(len(info["messages"]) for info in sessions.values())
+    print(f"Found {total} corrupted message(s):\n")
+    print("-" * 100)
+    
     for i, (session_id, info) in enumerate(sessions.items(), 1):
         print(f"\n[{i}] Session: {info['title']}")
         print(f"    Session ID: {session_id}")
@@ -425,22 +660,11 @@ def list_corrupted():
         
         for msg in info["messages"]:
             print(f"\n    - Message: {msg['message_id']}")
-            print(f"      Time: {msg['timestamp_str']}")
+            print(f"      Time: {_fmt_ts(msg['timestamp'])}")
             print(f"      Model: {msg['provider_id']}/{msg['model_id']}")
             print(f"      Error: {msg['error_message']}")
         
-        # Find messages that would be removed
-        msg_to_remove = find_message_to_remove(session_id, info["error_msg_index"])
-        error_messages = find_error_messages(session_id)
-        
-        total_msgs = (1 if msg_to_remove else 0) + len(error_messages)
-        total_parts = 0
-        if msg_to_remove:
-            total_parts += len(get_message_parts(msg_to_remove.get("id", "")))
-        for err_msg in error_messages:
-            total_parts += len(get_message_parts(err_msg.get("id", "")))
-        
-        print(f"\n    Fix: Remove {total_msgs} message(s) and {total_parts} part(s)")
+        print(f"\n    Fix: Remove {info['fix_messages']} message(s) and {info['fix_parts']} part(s)")
     
     print("\n" + "-" * 100)
     print(f"\nTo fix a specific session, run:")
@@ -453,40 +677,58 @@ def list_corrupted():
 def fix_command(target: str, dry_run: bool = False):
     """Fix a specific session or all corrupted sessions."""
     
-    corrupted = find_corrupted_messages()
+    # Complete scan left over from a failed message-ID search, if any
+    scanned = None
+    
+    # Exact IDs can be resolved without scanning the whole store
+    if target != "--all":
+        # Only the scoped scan sees every corrupted message of the session
+        corrupted = None
+        session_dir = _get_session_dir(target)
+        if session_dir is not None:
+            # A full session ID: only its own directory needs scanning
+            corrupted = _scan_one_session(session_dir)
+            match = max(corrupted, key=lambda x: x["timestamp"]) if corrupted else None
+        else:
+            scanned = []
+            match = _find_exact_target(target, scanned)
+        if match is not None:
+            _fix_sessions([(match["session_id"], match["error_msg_index"], corrupted)], dry_run)
+            return
+    
+    sessions_info = scan_sessions(raw=scanned)
     
-    if not corrupted:
+    if not sessions_info:
         print("No corrupted sessions found.")
         return
     
-    # Group by session and get error index
-    sessions_info = {}
-    for msg in corrupted:
-        sid = msg["session_id"]
-        if sid not in sessions_info:
-            sessions_info[sid] = {
-                "title": msg["session_title"],
-                "error_msg_index": msg["error_msg_index"],
-            }
-    
     # Get sessions to fix
     sessions_to_fix = []
     
     if target == "--all":
-        sessions_to_fix = [(sid, info["error_msg_index"]) for sid, info in sessions_info.items()]
+        sessions_to_fix = [
+            (sid, info["error_msg_index"], info["messages"])
+            for sid, info in sessions_info.items()
+        ]
         print(f"\nFixing all {len(sessions_to_fix)} corrupted session(s)...")
     else:
         # Check if target is a session ID
         for sid, info in sessions_info.items():
             if sid == target or target in sid:
-                sessions_to_fix.append((sid, info["error_msg_index"]))
+                sessions_to_fix.append((sid, info["error_msg_index"], info["messages"]))
                 break
         
         if not sessions_to_fix:
-            # Check if target is a message ID
+            # Check if target is a message ID, newest messages first
+            corrupted = sorted(
+                (msg for info in sessions_info.values() for msg in info["messages"]),
+                key=lambda x: x["timestamp"],
+                reverse=True,
+            )
             for msg in corrupted:
                 if msg["message_id"] == target or target in msg["message_id"]:
-                    sessions_to_fix.append((msg["session_id"], msg["error_msg_index"]))
+                    sid = msg["session_id"]
+                    sessions_to_fix.append((sid, msg["error_msg_index"], sessions_info[sid]["messages"]))
                     break
         
         if not sessions_to_fix:
@@ -496,15 +738,34 @@ def fix_command(target: str, dry_run: bool = False):
                 print(f"  - {sid} ({info['title']})")
             return
     
+    _fix_sessions(sessions_to_fix, dry_run)
+
+
+def _fix_sessions(sessions_to_fix: list[tuple], dry_run: bool = False):
+    """
+    Repair each (session_id, error_msg_index, corrupted) entry and report the outcome.
+    
+    corrupted holds the session's corrupted messages as found by the scan, or
+    None to have fix_session look them up.
+    """
     if dry_run:
         print("\n[DRY RUN] No changes will be made.\n")
     
-    for session_id, error_msg_index in sessions_to_fix:
+    for session_id, error_msg_index, corrupted in sessions_to_fix:
         title = get_session_title(session_id)
         print(f"\nProcessing session: {title}")
         print(f"  Session ID: {session_id}")
         
-        result = fix_session(session_id, error_msg_index, dry_run=dry_run)
+        # The corrupted messages are the session's error messages, no need to rescan
+        error_messages = None
+        if corrupted is not None:
+            error_messages = [
+                {"id": msg["message_id"], "_file_path": Path(msg["file_path"])}
+                for msg in corrupted
+            ]
+        
+        result = fix_session(session_id, error_msg_index, dry_run=dry_run,
+                             error_messages=error_messages)
         
         if result["success"]:
             print(f"  Status: {'WOULD SUCCEED' if dry_run else 'SUCCESS'}")